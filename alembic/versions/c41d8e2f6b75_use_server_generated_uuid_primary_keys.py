@@ -0,0 +1,51 @@
+"""Use server generated UUID primary keys
+
+Revision ID: c41d8e2f6b75
+Revises: 3b7e9a5c2d10
+Create Date: 2026-10-15 10:21:53.114208
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41d8e2f6b75'
+down_revision: Union[str, None] = '3b7e9a5c2d10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pgcrypto")
+    op.alter_column('users', 'id',
+               existing_type=sa.UUID(),
+               server_default=sa.text('gen_random_uuid()'),
+               existing_nullable=False)
+    op.alter_column('messages', 'id',
+               existing_type=sa.UUID(),
+               server_default=sa.text('gen_random_uuid()'),
+               existing_nullable=False)
+    op.alter_column('message_recipients', 'id',
+               existing_type=sa.UUID(),
+               server_default=sa.text('gen_random_uuid()'),
+               existing_nullable=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.alter_column('message_recipients', 'id',
+               existing_type=sa.UUID(),
+               server_default=None,
+               existing_nullable=False)
+    op.alter_column('messages', 'id',
+               existing_type=sa.UUID(),
+               server_default=None,
+               existing_nullable=False)
+    op.alter_column('users', 'id',
+               existing_type=sa.UUID(),
+               server_default=None,
+               existing_nullable=False)
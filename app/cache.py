@@ -0,0 +1,54 @@
+# Response caching setup
+import os
+from contextlib import suppress
+
+from fastapi_cache import FastAPICache
+from fastapi_cache.backends.inmemory import InMemoryBackend
+from fastapi_cache.backends.redis import RedisBackend
+from redis import asyncio as aioredis
+
+CACHE_PREFIX = "msgsys"
+CACHE_EXPIRE_SECONDS = 60
+
+
+def cache_key_builder(func, namespace="", *, request=None, response=None, args=(), kwargs=None):
+    """
+    Build a cache key from the endpoint's path parameters.
+
+    The `db` session is different for every request, so it is left out of the key.
+    Keys are deterministic, so a single cached response can be deleted by its exact key.
+    """
+    params = ":".join(
+        str(value) for name, value in sorted((kwargs or {}).items()) if name != "db"
+    )
+    return f"{namespace}:{params}:{func.__name__}"
+
+
+def init_cache():
+    """
+    Initialize response caching. Caching is only enabled when REDIS_URL is set,
+    so every worker shares the same cache and invalidation.
+    """
+    redis_url = os.getenv("REDIS_URL")
+    backend = RedisBackend(aioredis.from_url(redis_url)) if redis_url else InMemoryBackend()
+    FastAPICache.init(
+        backend,
+        prefix=CACHE_PREFIX,
+        expire=CACHE_EXPIRE_SECONDS,
+        key_builder=cache_key_builder,
+        enable=bool(redis_url),
+    )
+
+
+async def invalidate_message(message_id):
+    """
+    Drop the cached recipient list of a message. Marking a message as read does
+    not change its body, so the cached message details are kept.
+    """
+    if not FastAPICache.get_enable():
+        return
+    key = f"{CACHE_PREFIX}:messages:{message_id}:get_message_recipient"
+    # Delete through the backend: FastAPICache.clear always passes the prefix as a
+    # namespace, which RedisBackend resolves with a blocking KEYS scan.
+    with suppress(KeyError):  # InMemoryBackend raises when the key is not cached
+        await FastAPICache.get_backend().clear(key=key)
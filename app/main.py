@@ -1,10 +1,20 @@
 from fastapi import FastAPI
+from fastapi.middleware.gzip import GZipMiddleware
 from contextlib import asynccontextmanager
 from . import models
+from .cache import init_cache
 from .db import engine
 from .routes import api_router
 
-app = FastAPI(title="Messaging System API", version="1.0.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    init_cache()
+    yield
+
+app = FastAPI(title="Messaging System API", version="1.0.0", lifespan=lifespan)
+
+# Compress large JSON responses such as inbox listings.
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
 
 app.include_router(api_router, prefix="/api/v1")
 
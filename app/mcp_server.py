@@ -1,33 +1,20 @@
-from fastapi import FastAPI
 from fastapi_mcp.server import FastApiMCP
 
-from .routes import api_router 
-from .db import engine, Base
+from .main import app as base_app
 
 def create_mcp_app():
-    # Initialize the native FastAPI application.
-    app = FastAPI(
-        title="FastAPI MCP Assignment Server",
-        description="This is a FastAPI application transformed into an MCP-compatible server for user and message management.",
-        version="0.0.1",
-    )
+    # Reuse the main FastAPI application instead of building a second one, so both
+    # entrypoints share a single router, middleware stack and OpenAPI schema.
 
     # Initialize FastApiMCP by passing in the original FastAPI 'app' object.
     # FastApiMCP will automatically make the necessary changes on this 'app' object
-    # to make it MCP-compatible.
-    mcp_instance = FastApiMCP(app)
+    # to make it MCP-compatible. The routes from api_router are already included,
+    # so they are detected by FastApiMCP and converted to tools.
+    mcp_instance = FastApiMCP(base_app)
 
-    # Include your defined routes from api_router into the root 'app' application.
-    # These routes will be automatically detected by FastApiMCP and converted to tools.
-    app.include_router(api_router)
-
-    @app.get("/")
-    async def root():
-        return {"message": "Welcome to FastAPI MCP Server!"}
-    
     # Returns the original FastAPI 'app' object.
     # This is the ASGI application configured with the MCP features that Uvicorn expects to run.
-    return app
+    return base_app
 
 # Assign global variable 'app' to Uvicorn.
 app = create_mcp_app()
\ No newline at end of file
@@ -1,22 +1,58 @@
 # SQLAlchemy or Tortoise models
-import uuid
-from datetime import datetime, timezone
-
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, String
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Index, String
 from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import relationship
+from sqlalchemy.sql.functions import FunctionElement
 
 from .db import Base
 
+class gen_random_uuid(FunctionElement):
+    """
+    Random UUID generated by the database server, used as the primary key default.
+    """
+    type = UUID(as_uuid=True)
+    inherit_cache = True
+
+
+@compiles(gen_random_uuid)
+def _compile_gen_random_uuid(element, compiler, **kw):
+    return "gen_random_uuid()"
+
+
+@compiles(gen_random_uuid, "sqlite")
+def _compile_gen_random_uuid_sqlite(element, compiler, **kw):
+    # SQLite has no UUID function; UUID columns are stored as 32 hex characters.
+    return "lower(hex(randomblob(16)))"
+
+
+class utc_now(FunctionElement):
+    """
+    Current naive UTC time from the database server, used as the timestamp default.
+    """
+    type = DateTime(timezone=False)
+    inherit_cache = True
+
+
+@compiles(utc_now)
+def _compile_utc_now(element, compiler, **kw):
+    # now() is in the session time zone; the columns store naive UTC.
+    return "timezone('utc', now())"
+
+
+@compiles(utc_now, "sqlite")
+def _compile_utc_now_sqlite(element, compiler, **kw):
+    # SQLite's CURRENT_TIMESTAMP is already UTC.
+    return "CURRENT_TIMESTAMP"
+
+
 class User(Base):
     __tablename__ = "users"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=gen_random_uuid())
     email = Column(String, unique=True, index=True)
     name = Column(String)
-    created_at = Column(
-        DateTime, default=datetime.now(timezone.utc).replace(tzinfo=None)
-    )
+    created_at = Column(DateTime(timezone=False), server_default=utc_now(), nullable=False)
 
     # Relationships
     sent_messages = relationship("Message", back_populates="sender")
@@ -26,24 +62,25 @@ class User(Base):
 class Message(Base):
     __tablename__ = "messages"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=gen_random_uuid())
     sender_id = Column(UUID(as_uuid=True), ForeignKey("users.id"))
     subject = Column(String, nullable=True)
     content = Column(String)
-    timestamp = Column(
-        DateTime, default=datetime.now(timezone.utc).replace(tzinfo=None)
-    )
+    timestamp = Column(DateTime(timezone=False), server_default=utc_now(), nullable=False)
 
     # Relationships
     sender = relationship("User", back_populates="sent_messages")
     recipients = relationship("MessageRecipient", back_populates="message")
 
+    # Sent messages lookup (also covers sender_id-only filters).
+    __table_args__ = (Index("ix_message_sender_ts", "sender_id", "timestamp"),)
+
 
 class MessageRecipient(Base):
     __tablename__ = "message_recipients"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    message_id = Column(UUID(as_uuid=True), ForeignKey("messages.id"))
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=gen_random_uuid())
+    message_id = Column(UUID(as_uuid=True), ForeignKey("messages.id"), index=True)
     recipient_id = Column(UUID(as_uuid=True), ForeignKey("users.id"))
     read = Column(Boolean, default=False)
     read_at = Column(DateTime, nullable=True)
@@ -51,3 +88,6 @@ class MessageRecipient(Base):
     # Relationships
     message = relationship("Message", back_populates="recipients")
     recipient = relationship("User", back_populates="received_messages")
+
+    # Inbox and unread inbox lookups (also covers recipient_id-only filters).
+    __table_args__ = (Index("ix_msgrcpt_recipient_unread", "recipient_id", "read"),)
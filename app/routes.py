@@ -1,19 +1,45 @@
 # FastAPI routes
 import uuid
 from datetime import datetime, timezone
-from typing import List, Annotated
+from typing import List, Annotated, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status, Body, Path
+from fastapi import APIRouter, Depends, HTTPException, status, Body, Path, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from sqlalchemy.orm import joinedload
+from fastapi_cache.decorator import cache
+from sqlalchemy import bindparam, exists, insert, select, tuple_
+from sqlalchemy.orm import raiseload
 
 from . import models, schemas
+from .cache import invalidate_message
 from .db import get_db
 
 # Initializing the main APIRouter for all APIs.
 api_router = APIRouter()
 
+# Primary key lookups are built once at import time and executed with bound
+# parameters, so requests reuse the same statement and its cached compiled SQL.
+_USER_BY_ID = select(models.User).where(models.User.id == bindparam("user_id"))
+_MESSAGE_BY_ID = select(models.Message).where(models.Message.id == bindparam("message_id"))
+_RECIPIENT_ENTRY_BY_ID = select(models.MessageRecipient).where(
+    models.MessageRecipient.id == bindparam("recipient_entry_id")
+)
+_USER_EXISTS = select(exists().where(models.User.id == bindparam("user_id")))
+_MESSAGE_EXISTS = select(exists().where(models.Message.id == bindparam("message_id")))
+
+async def _user_exists(db: AsyncSession, user_id: uuid.UUID) -> bool:
+    """
+    Check whether a user exists without loading the User entity.
+    """
+    result = await db.execute(_USER_EXISTS, {"user_id": user_id})
+    return result.scalar()
+
+async def _message_exists(db: AsyncSession, message_id: uuid.UUID) -> bool:
+    """
+    Check whether a message exists without loading the Message entity.
+    """
+    result = await db.execute(_MESSAGE_EXISTS, {"message_id": message_id})
+    return result.scalar()
+
 # =====================================================================
 # USER API
 # =====================================================================
@@ -29,35 +55,37 @@ async def create_user(user: Annotated[schemas.UserCreate, Body()], db: AsyncSess
     Create a new user in the system.
     """
     result = await db.execute(select(models.User).filter(models.User.email == user.email))
-    db_user = result.scalars().first()
+    db_user = result.scalar_one_or_none()
 
     if db_user:
         raise HTTPException(status_code=400, detail="Email already registered.")
 
-    new_user_id = uuid.uuid4()
-    db_user = models.User(id=new_user_id, email=user.email, name=user.name)
+    db_user = models.User(email=user.email, name=user.name)
     db.add(db_user)
     await db.commit()
     await db.refresh(db_user)
     return db_user
 
 @api_router.get("/users/{user_id}", response_model=schemas.User, tags=["users"])
+@cache(namespace="users")
 async def read_user(user_id: Annotated[uuid.UUID, Path()], db: AsyncSession = Depends(get_db)):
     """
     Get detailed information of a user by ID.
     """
-    result = await db.execute(select(models.User).filter(models.User.id == user_id))
-    db_user = result.scalars().first()
+    result = await db.execute(_USER_BY_ID, {"user_id": user_id})
+    db_user = result.scalar_one_or_none()
     if db_user is None:
         raise HTTPException(status_code=404, detail="User not found.")
-    return db_user
+    return schemas.User.model_validate(db_user)
 
 @api_router.get("/users/", response_model=List[schemas.User], tags=["users"])
 async def read_users(skip: int = 0, limit: int = 100, db: AsyncSession = Depends(get_db)):
     """
     List all users in the system.
     """
-    result = await db.execute(select(models.User).offset(skip).limit(limit))
+    result = await db.execute(
+        select(models.User).options(raiseload("*")).offset(skip).limit(limit)
+    )
     users = result.scalars().all()
     return users
 
@@ -77,40 +105,45 @@ async def create_message(
     """
     Send a message to one or more recipients.
     """
-    result_sender = await db.execute(select(models.User).filter(models.User.id == message_data.sender_id))
-    sender = result_sender.scalars().first()
-    if not sender:
+    # Validate the sender and all recipients in a single round trip.
+    user_ids = {message_data.sender_id, *message_data.recipient_ids}
+    result_users = await db.execute(select(models.User.id).filter(models.User.id.in_(user_ids)))
+    existing_user_ids = set(result_users.scalars().all())
+    if message_data.sender_id not in existing_user_ids:
         raise HTTPException(status_code=404, detail="Sender not found.")
 
-    new_message_id = uuid.uuid4()
-    db_message = models.Message(
-        id=new_message_id,
-        sender_id=message_data.sender_id,
-        subject=message_data.subject,
-        content=message_data.content,
-        timestamp=datetime.now(timezone.utc).replace(tzinfo=None),
-    )
-    db.add(db_message)
-
-    # Create recipient records for messages.
     if not message_data.recipient_ids:
         raise HTTPException(
             status_code=400, detail="Message must have at least one recipient."
         )
 
-    for recipient_id in message_data.recipient_ids:
-        result_recipient = await db.execute(select(models.User).filter(models.User.id == recipient_id))
-        db_recipient_user = result_recipient.scalars().first()
-        if not db_recipient_user:
-            await db.rollback()
-            raise HTTPException(
-                status_code=404, detail=f"Recipient with ID {recipient_id} not found."
-            )
-
-        db_msg_recipient = models.MessageRecipient(
-            message_id=new_message_id, recipient_id=recipient_id
+    missing_ids = [
+        recipient_id
+        for recipient_id in message_data.recipient_ids
+        if recipient_id not in existing_user_ids
+    ]
+    if missing_ids:
+        raise HTTPException(
+            status_code=404, detail=f"Recipient with ID {missing_ids[0]} not found."
         )
-        db.add(db_msg_recipient)
+
+    db_message = models.Message(
+        sender_id=message_data.sender_id,
+        subject=message_data.subject,
+        content=message_data.content,
+    )
+    db.add(db_message)
+    # Flush to get the message id generated by the database.
+    await db.flush()
+
+    # Create recipient records for messages with a single multi-row INSERT.
+    await db.execute(
+        insert(models.MessageRecipient),
+        [
+            {"message_id": db_message.id, "recipient_id": recipient_id, "read": False}
+            for recipient_id in message_data.recipient_ids
+        ],
+    )
 
     await db.commit()
     await db.refresh(db_message)
@@ -125,122 +158,156 @@ async def get_sent_messages(user_id: Annotated[uuid.UUID, Path()], db: AsyncSess
     """
     View a list of all messages a user has sent.
     """
-    result_user = await db.execute(select(models.User).filter(models.User.id == user_id))
-    user_exists = result_user.scalars().first()
-    if not user_exists:
+    # Load sent messages. Messages reference their sender, so the existence
+    # check is only needed when the user has not sent anything.
+    # Rows come straight from the database, so model_construct skips validation.
+    stmt = select(
+        models.Message.id,
+        models.Message.sender_id,
+        models.Message.subject,
+        models.Message.content,
+        models.Message.timestamp,
+    ).filter(models.Message.sender_id == user_id)
+    result_messages = await db.execute(stmt)
+    messages = [schemas.Message.model_construct(**row) for row in result_messages.mappings()]
+    if not messages and not await _user_exists(db, user_id):
         raise HTTPException(status_code=404, detail="User not found.")
-
-    # Load sent messages.
-    result_messages = await db.execute(select(models.Message).filter(models.Message.sender_id == user_id))
-    messages = result_messages.scalars().all()
     return messages
 
-@api_router.get(
-    "/users/{user_id}/inbox",
-    response_model=List[schemas.MessageInboxItem],
-    tags=["messages", "users"],
-)
-async def get_inbox_messages(user_id: Annotated[uuid.UUID, Path()], db: AsyncSession = Depends(get_db)): # AsyncSession
+def _inbox_stmt(
+    user_id: uuid.UUID,
+    limit: int,
+    cursor: Optional[datetime],
+    cursor_id: Optional[uuid.UUID],
+):
     """
-    View all messages in a user's inbox. Include both read and unread messages.
+    Build a projected select of the columns needed for a user's inbox items,
+    newest first. `cursor` and `cursor_id` are the timestamp and recipient entry id
+    of the last item of the previous page; the entry id breaks ties between equal
+    timestamps, and is unique even when a message lists the same recipient twice.
     """
-    result_user = await db.execute(select(models.User).filter(models.User.id == user_id))
-    user_exists = result_user.scalars().first()
-    if not user_exists:
-        raise HTTPException(status_code=404, detail="User not found.")
-
+    if (cursor is None) != (cursor_id is None):
+        raise HTTPException(
+            status_code=422, detail="cursor and cursor_id must be given together."
+        )
     stmt = (
-        select(models.Message, models.MessageRecipient)
+        select(
+            models.Message.id,
+            models.Message.sender_id,
+            models.Message.subject,
+            models.Message.content,
+            models.Message.timestamp,
+            models.MessageRecipient.id.label("recipient_entry_id"),
+            models.MessageRecipient.read,
+            models.MessageRecipient.read_at,
+            models.User.email.label("sender_email"),
+            models.User.name.label("sender_name"),
+            models.User.created_at.label("sender_created_at"),
+        )
         .join(
             models.MessageRecipient,
             models.Message.id == models.MessageRecipient.message_id,
         )
-        .options(joinedload(models.Message.sender))
+        .join(models.User, models.User.id == models.Message.sender_id)
         .filter(models.MessageRecipient.recipient_id == user_id)
+        .order_by(models.Message.timestamp.desc(), models.MessageRecipient.id.desc())
+        .limit(limit)
     )
-    result_inbox = await db.execute(stmt)
-    inbox_entries = result_inbox.all()
-
-    # Convert the results to the MessageInboxItem format.
-    result = []
-    for message, recipient_entry in inbox_entries:
-        sender_schema = (
-            schemas.User.model_validate(message.sender) if message.sender else None
+    if cursor is not None:
+        stmt = stmt.filter(
+            tuple_(models.Message.timestamp, models.MessageRecipient.id) < (cursor, cursor_id)
         )
+    return stmt
 
+def _to_inbox_items(rows) -> List[schemas.MessageInboxItem]:
+    """
+    Convert projected inbox rows to the MessageInboxItem format.
+    """
+    # Many inbox rows usually share a sender, so each sender is validated only once.
+    senders: dict[uuid.UUID, schemas.User] = {}
+    result = []
+    for row in rows:
+        sender = senders.get(row["sender_id"])
+        if sender is None:
+            sender = senders[row["sender_id"]] = schemas.User(
+                id=row["sender_id"],
+                email=row["sender_email"],
+                name=row["sender_name"],
+                created_at=row["sender_created_at"],
+            )
         result.append(
             schemas.MessageInboxItem(
-                id=message.id,
-                sender_id=message.sender_id,
-                subject=message.subject,
-                content=message.content,
-                timestamp=message.timestamp,
-                recipient_entry_id=recipient_entry.id,
-                read=recipient_entry.read,
-                read_at=recipient_entry.read_at,
-                sender=sender_schema,
+                id=row["id"],
+                sender_id=row["sender_id"],
+                subject=row["subject"],
+                content=row["content"],
+                timestamp=row["timestamp"],
+                recipient_entry_id=row["recipient_entry_id"],
+                read=row["read"],
+                read_at=row["read_at"],
+                sender=sender,
             )
         )
     return result
 
+@api_router.get(
+    "/users/{user_id}/inbox",
+    response_model=List[schemas.MessageInboxItem],
+    tags=["messages", "users"],
+)
+async def get_inbox_messages(
+    user_id: Annotated[uuid.UUID, Path()],
+    limit: Annotated[int, Query(ge=1, le=100)] = 50,
+    cursor: Optional[datetime] = None,
+    cursor_id: Optional[uuid.UUID] = None,
+    db: AsyncSession = Depends(get_db), # AsyncSession
+):
+    """
+    View messages in a user's inbox, newest first. Include both read and unread messages.
+    Pass the `timestamp` and `recipient_entry_id` of the last returned message as
+    `cursor` and `cursor_id` to get the next page.
+    """
+    if not await _user_exists(db, user_id):
+        raise HTTPException(status_code=404, detail="User not found.")
+
+    result_inbox = await db.execute(_inbox_stmt(user_id, limit, cursor, cursor_id))
+    return _to_inbox_items(result_inbox.mappings().all())
+
 @api_router.get(
     "/users/{user_id}/inbox/unread",
     response_model=List[schemas.MessageInboxItem],
     tags=["messages", "users"],
 )
-async def get_unread_inbox_messages(user_id: Annotated[uuid.UUID, Path()], db: AsyncSession = Depends(get_db)): # AsyncSession
+async def get_unread_inbox_messages(
+    user_id: Annotated[uuid.UUID, Path()],
+    limit: Annotated[int, Query(ge=1, le=100)] = 50,
+    cursor: Optional[datetime] = None,
+    cursor_id: Optional[uuid.UUID] = None,
+    db: AsyncSession = Depends(get_db), # AsyncSession
+):
     """
-    View all unread messages in a user's inbox.
+    View unread messages in a user's inbox, newest first.
+    Pass the `timestamp` and `recipient_entry_id` of the last returned message as
+    `cursor` and `cursor_id` to get the next page.
     """
-    result_user = await db.execute(select(models.User).filter(models.User.id == user_id))
-    user_exists = result_user.scalars().first()
-    if not user_exists:
+    if not await _user_exists(db, user_id):
         raise HTTPException(status_code=404, detail="User not found.")
 
-    stmt = (
-        select(models.Message, models.MessageRecipient)
-        .join(
-            models.MessageRecipient,
-            models.Message.id == models.MessageRecipient.message_id,
-        )
-        .options(joinedload(models.Message.sender))
-        .filter(
-            models.MessageRecipient.recipient_id == user_id,
-            models.MessageRecipient.read == False,
-        )
-    )
+    stmt = _inbox_stmt(user_id, limit, cursor, cursor_id).filter(models.MessageRecipient.read == False)
     result_inbox = await db.execute(stmt)
-    inbox_entries = result_inbox.all()
+    return _to_inbox_items(result_inbox.mappings().all())
 
-    # Convert the results to the MessageInboxItem format.
-    result = []
-    for message, recipient_entry in inbox_entries:
-        sender_schema = (
-            schemas.User.model_validate(message.sender) if message.sender else None
-        )
-        result.append(
-            schemas.MessageInboxItem(
-                id=message.id,
-                sender_id=message.sender_id,
-                subject=message.subject,
-                content=message.content,
-                timestamp=message.timestamp,
-                recipient_entry_id=recipient_entry.id,
-                read=recipient_entry.read,
-                read_at=recipient_entry.read_at,
-                sender=sender_schema,
-            )
-        )
-    return result
-
-@api_router.get("/messages/{message_id}/recipients", tags=["messages"])
+@api_router.get(
+    "/messages/{message_id}/recipients",
+    response_model=List[schemas.MessageRecipientStatus],
+    tags=["messages"],
+)
+@cache(namespace="messages")
 async def get_message_recipient(message_id: Annotated[uuid.UUID, Path()], db: AsyncSession = Depends(get_db)): # AsyncSession
     """
     View all recipients of a specific message and their read status.
     """
-    result_message = await db.execute(select(models.Message).filter(models.Message.id == message_id))
-    message_exists = result_message.scalars().first()
-    if not message_exists:
+    if not await _message_exists(db, message_id):
         raise HTTPException(status_code=404, detail="Message not found.")
 
     # Get recipient information and join with the User table to get name/email.
@@ -256,14 +323,14 @@ async def get_message_recipient(message_id: Annotated[uuid.UUID, Path()], db: As
     result = []
     for recipient_entry, user in recipient_data:
         result.append(
-            {
-                "recipient_entry_id": recipient_entry.id,
-                "recipient_id": user.id,
-                "recipient_name": user.name,
-                "recipient_email": user.email,
-                "read": recipient_entry.read,
-                "read_at": recipient_entry.read_at,
-            }
+            schemas.MessageRecipientStatus(
+                recipient_entry_id=recipient_entry.id,
+                recipient_id=user.id,
+                recipient_name=user.name,
+                recipient_email=user.email,
+                read=recipient_entry.read,
+                read_at=recipient_entry.read_at,
+            )
         )
     return result
 
@@ -276,8 +343,8 @@ async def mark_message_as_read(recipient_entry_id: Annotated[uuid.UUID, Path()],
     """
     Mark a specific message (received by a particular user) as read.
     """
-    result_entry = await db.execute(select(models.MessageRecipient).filter(models.MessageRecipient.id == recipient_entry_id))
-    db_recipient_entry = result_entry.scalars().first()
+    result_entry = await db.execute(_RECIPIENT_ENTRY_BY_ID, {"recipient_entry_id": recipient_entry_id})
+    db_recipient_entry = result_entry.scalar_one_or_none()
 
     if db_recipient_entry is None:
         raise HTTPException(
@@ -290,19 +357,21 @@ async def mark_message_as_read(recipient_entry_id: Annotated[uuid.UUID, Path()],
         db.add(db_recipient_entry)
         await db.commit()
         await db.refresh(db_recipient_entry)
+        await invalidate_message(db_recipient_entry.message_id)
 
     return db_recipient_entry
 
 @api_router.get(
     "/messages/{message_id}", response_model=schemas.Message, tags=["messages"]
 )
+@cache(namespace="messages")
 async def read_message(message_id: Annotated[uuid.UUID, Path()], db: AsyncSession = Depends(get_db)): # AsyncSession
     """
     Get message details by ID.
     """
-    result_message = await db.execute(select(models.Message).filter(models.Message.id == message_id))
-    db_message = result_message.scalars().first()
+    result_message = await db.execute(_MESSAGE_BY_ID, {"message_id": message_id})
+    db_message = result_message.scalar_one_or_none()
     if db_message is None:
         raise HTTPException(status_code=404, detail="Message not found.") # Sửa "Messages" thành "Message"
 
-    return db_message
\ No newline at end of file
+    return schemas.Message.model_validate(db_message)
\ No newline at end of file
@@ -59,6 +59,16 @@ class MessageRecipient(MessageRecipientBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+# Schema for a message's recipient list with read status
+class MessageRecipientStatus(BaseModel):
+    recipient_entry_id: uuid.UUID  # ID of the MessageRecipient record
+    recipient_id: uuid.UUID
+    recipient_name: str
+    recipient_email: EmailStr
+    read: bool
+    read_at: Optional[datetime] = None
+
+
 # --- Message Detail Schemas ---
 class MessageDetail(Message):
     sender: User  # Eager loaded User object for the sender
@@ -0,0 +1,115 @@
+# Shared test fixtures: database engine, per-test session and API client
+import os
+from contextvars import ContextVar
+
+import pytest_asyncio
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.db import Base, get_db
+from app.main import app
+
+# Configure a separate database for testing (SQLite in-memory).
+# This allows tests to run quickly and independently without affecting the development database.
+# A shared-cache in-memory database avoids disk writes; StaticPool keeps a single
+# connection open so the schema survives across sessions. Each pytest-xdist worker
+# gets its own named database.
+_WORKER = os.environ.get("PYTEST_XDIST_WORKER", "gw0")
+SQLALCHEMY_DATABASE_URL = (
+    f"sqlite+aiosqlite:///file:memdb_{_WORKER}?mode=memory&cache=shared&uri=true"
+)
+test_engine = create_async_engine(
+    SQLALCHEMY_DATABASE_URL,
+    connect_args={"check_same_thread": False, "uri": True},
+    poolclass=StaticPool,
+)
+
+
+@event.listens_for(test_engine.sync_engine, "connect")
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Disable durability features the throwaway test database does not need."""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA synchronous=OFF")
+    cursor.execute("PRAGMA journal_mode=MEMORY")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA locking_mode=EXCLUSIVE")
+    cursor.execute("PRAGMA cache_size=-20000")
+    # Tests control statement ordering; fail fast instead of sleeping on a lock.
+    cursor.execute("PRAGMA busy_timeout=0")
+    cursor.close()
+    # Let SQLAlchemy emit BEGIN itself; the driver's implicit transaction
+    # handling breaks SAVEPOINTs, which the per-test rollback relies on.
+    dbapi_connection.isolation_level = None
+
+
+@event.listens_for(test_engine.sync_engine, "begin")
+def begin_transaction(conn):
+    # Take the write lock up front; every test transaction writes.
+    conn.exec_driver_sql("BEGIN IMMEDIATE")
+
+
+# Session of the currently running test, read by the shared client's get_db override.
+current_session: ContextVar[AsyncSession] = ContextVar("current_session")
+
+
+async def override_get_db():
+    yield current_session.get()
+
+
+@pytest_asyncio.fixture(name="schema", scope="session", autouse=True)
+async def schema_fixture():
+    """
+    Create the tables once for the whole test session. Tests are isolated by
+    the per-test rollback, so there is nothing to drop afterwards; disposing
+    the engine closes the in-memory database.
+    """
+    async with test_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield
+    await test_engine.dispose()
+
+
+@pytest_asyncio.fixture(name="session")
+async def session_fixture(schema):
+    """
+    Run each test inside an outer transaction that is rolled back afterwards.
+    Commits made by the test or the API only release a SAVEPOINT.
+    """
+    async with test_engine.connect() as conn:
+        await conn.begin()
+        db = AsyncSession(
+            bind=conn,
+            autoflush=False,
+            expire_on_commit=False,
+            join_transaction_mode="create_savepoint",
+        )
+        token = current_session.set(db)
+        try:
+            yield db
+        finally:
+            current_session.reset(token)
+            await db.close()
+            await conn.rollback()
+
+
+@pytest_asyncio.fixture(name="app_client", scope="session")
+async def app_client_fixture():
+    """API client shared by all tests; get_db resolves to the current test's session."""
+    app.dependency_overrides[get_db] = override_get_db
+    try:
+        # Run the app lifespan (cache setup) on the test event loop.
+        async with app.router.lifespan_context(app):
+            async with AsyncClient(
+                transport=ASGITransport(app=app), base_url="http://test"
+            ) as client:
+                yield client
+    finally:
+        app.dependency_overrides.clear()
+
+
+@pytest_asyncio.fixture(name="client")
+async def client_fixture(app_client: AsyncClient, session: AsyncSession):
+    """The shared API client, bound to this test's session."""
+    return app_client